@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Entry point for the meal prep agent - a streaming REPL.
+"""
+
+import asyncio
+import getpass
+import os
+from dotenv import load_dotenv
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from meal_prep_agent.simple_agent import create_meal_prep_agent, shutdown_meal_prep_agent
+
+# Load environment variables
+load_dotenv()
+
+async def _stream_response(agent, initial_state, config):
+    """Stream one agent turn, printing tokens as they arrive."""
+    async for chunk, _ in agent.astream(initial_state, config, stream_mode="messages"):
+        # The stream carries messages from every node, including raw
+        # ToolMessage payloads; only assistant tokens belong on screen
+        if isinstance(chunk, AIMessageChunk) and chunk.content:
+            print(chunk.content, end="", flush=True)
+    print()
+
+async def _repl():
+    """Run the REPL loop on a single event loop.
+
+    The agent's pooled HTTP client and async checkpointer are bound to
+    the loop they were created on, so each turn must reuse that loop
+    rather than spinning up (and tearing down) its own.
+    """
+    agent = create_meal_prep_agent()
+    config = {"configurable": {"thread_id": getpass.getuser()}}
+
+    try:
+        while True:
+            user_input = input("\n👤 You: ").strip()
+
+            if user_input.lower() in ['quit', 'exit', 'bye']:
+                print("👋 Goodbye! Happy meal prepping!")
+                break
+
+            if not user_input:
+                continue
+
+            try:
+                print("\n🤖 Agent: ", end="", flush=True)
+                initial_state = {"messages": [HumanMessage(content=user_input)]}
+                # Stream tokens as they arrive instead of blocking on the full run
+                await _stream_response(agent, initial_state, config)
+
+            except Exception as e:
+                print(f"\n❌ Error: {e}")
+    finally:
+        await shutdown_meal_prep_agent()
+
+def main():
+    """Run the interactive meal prep agent REPL with token streaming."""
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ OPENAI_API_KEY not found in environment variables!")
+        print("Please set your OpenAI API key in a .env file")
+        print("Add: OPENAI_API_KEY=your_openai_key_here")
+        return
+
+    print("🍽️ Meal Prep Agent")
+    print("Type 'quit' to exit")
+    print("=" * 50)
+
+    asyncio.run(_repl())
+
+if __name__ == "__main__":
+    main()
@@ -3,48 +3,168 @@
 Nutrition data cache for Tesco products to avoid redundant API calls.
 """
 
-import json
-import os
+import atexit
+import functools
+import sqlite3
+import threading
+import time
+from collections import Counter
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+import orjson
+from cachetools import LRUCache
+
+# Flush pending hit-count deltas to disk once this many hits accumulate
+HIT_FLUSH_THRESHOLD = 32
+
+# Bound on the number of products kept hot in memory
+HOT_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=4)
+def _file_size_kb(path: str, time_bucket: int) -> int:
+    """File size in KB, cached per 5-second bucket to avoid stat() churn."""
+    p = Path(path)
+    return p.stat().st_size // 1024 if p.exists() else 0
+
 class NutritionCache:
-    """Cache for storing Tesco product nutrition data locally."""
-    
-    def __init__(self, cache_file: str = "tesco_nutrition_cache.json"):
+    """Cache for storing Tesco product nutrition data locally.
+
+    Backed by SQLite (WAL mode) so each write is a single-row upsert instead
+    of a full-file rewrite. A bounded LRU tier keeps the working set of
+    products in memory, so startup is instant and resident size stays flat
+    no matter how large the on-disk cache grows.
+    """
+
+    def __init__(self, cache_file: str = "tesco_nutrition_cache.db"):
         """Initialize the nutrition cache."""
         self.cache_file = Path(cache_file)
-        self.cache_data = self._load_cache()
-    
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load existing cache data from file."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"📁 Loaded nutrition cache with {len(data.get('products', {}))} products")
-                    return data
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"⚠️ Error loading cache: {e}, starting fresh")
-        
-        # Return empty cache structure
-        return {
-            "cache_version": "1.0",
-            "last_updated": datetime.now().isoformat(),
-            "products": {}
-        }
-    
-    def _save_cache(self) -> None:
-        """Save cache data to file."""
+        # Nutrition fetches fan out on a thread pool, so the connection
+        # must outlive its creating thread and every access holds the
+        # lock (re-entrant: stats flush pending hits while holding it)
+        self.conn = sqlite3.connect(
+            str(self.cache_file), isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.RLock()
+        self._setup_db()
+        self._hot: LRUCache = LRUCache(maxsize=HOT_CACHE_SIZE)
+        self._pending_hits: Counter = Counter()
+        self._total_hits = self._load_total_hits()
+        atexit.register(self._flush_hits)
+
+    def _setup_db(self) -> None:
+        """Configure the SQLite connection and create the schema."""
+        self.conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS products (
+                key TEXT PRIMARY KEY,
+                product_name TEXT,
+                product_url TEXT,
+                nutrition TEXT,
+                cache_hits INTEGER DEFAULT 0,
+                cached_at TEXT
+            )"""
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hits ON products(cache_hits DESC)"
+        )
+        self._migrate_legacy_json()
+
+    def _migrate_legacy_json(self) -> None:
+        """Import the old JSON cache file into SQLite (one-time migration)."""
+        legacy_file = self.cache_file.with_suffix('.json')
+        if not legacy_file.exists():
+            return
+
+        # One-shot: once the JSON has been imported (or found already
+        # superseded), never look at it again — otherwise clearing the
+        # cache resurrects the stale entries on the next start
+        done = self.conn.execute(
+            "SELECT value FROM metadata WHERE key = 'legacy_migrated'"
+        ).fetchone()
+        if done is not None:
+            return
+
+        row_count = self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        if row_count > 0:
+            self._mark_legacy_migrated()
+            return
+
         try:
-            self.cache_data["last_updated"] = datetime.now().isoformat()
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
-            print(f"💾 Saved nutrition cache with {len(self.cache_data['products'])} products")
-        except IOError as e:
-            print(f"❌ Error saving cache: {e}")
-    
+            with open(legacy_file, 'rb') as f:
+                data = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError) as e:
+            print(f"⚠️ Error reading legacy cache: {e}, skipping migration")
+            return
+
+        products = data.get("products", {})
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    key,
+                    entry.get("product_name", ""),
+                    entry.get("product_url", ""),
+                    orjson.dumps(entry.get("nutrition", {})).decode(),
+                    entry.get("cache_hits", 0),
+                    entry.get("cached_at", ""),
+                )
+                for key, entry in products.items()
+            ]
+        )
+        # Imported rows carry their old per-product hit counts, so the
+        # running total must match (a prior clear may have zeroed it)
+        total = sum(entry.get("cache_hits", 0) for entry in products.values())
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata VALUES ('total_hits', ?)", (total,)
+        )
+        self._mark_legacy_migrated()
+        print(f"📦 Migrated {len(products)} products from legacy JSON cache")
+
+    def _mark_legacy_migrated(self) -> None:
+        """Record that the legacy JSON file has been dealt with."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata VALUES ('legacy_migrated', '1')"
+        )
+
+    def _load_total_hits(self) -> int:
+        """Load the running hit total, computing it once if not yet stored."""
+        row = self.conn.execute(
+            "SELECT value FROM metadata WHERE key = 'total_hits'"
+        ).fetchone()
+        if row is not None:
+            return int(row[0])
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(cache_hits), 0) FROM products"
+        ).fetchone()[0]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata VALUES ('total_hits', ?)", (total,)
+        )
+        return total
+
+    def _touch_last_updated(self) -> None:
+        """Record the last modification time in the metadata table."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata VALUES ('last_updated', ?)",
+            (datetime.now().isoformat(),)
+        )
+
+    def _get_last_updated(self) -> Optional[str]:
+        """Read the last modification time from the metadata table."""
+        row = self.conn.execute(
+            "SELECT value FROM metadata WHERE key = 'last_updated'"
+        ).fetchone()
+        return row[0] if row else None
+
     def _get_product_key(self, product_url: str) -> str:
         """Generate a cache key from product URL."""
         # Extract product ID from URL
@@ -52,151 +172,217 @@ class NutritionCache:
             product_id = product_url.split('/products/')[-1]
             return product_id
         return product_url
-    
+
     def get_nutrition(self, product_url: str, product_name: str = "") -> Optional[Dict[str, Any]]:
         """Get nutrition data from cache if available."""
         key = self._get_product_key(product_url)
-        
-        if key in self.cache_data["products"]:
-            cached_product = self.cache_data["products"][key]
+
+        with self._lock:
+            nutrition = self._hot.get(key)
+            if nutrition is None:
+                row = self.conn.execute(
+                    "SELECT nutrition FROM products WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    nutrition = orjson.loads(row[0]) if row[0] else {}
+                    self._hot[key] = nutrition
+
+        if nutrition is not None:
             print(f"🎯 Cache HIT for {product_name or key}")
-            return cached_product.get("nutrition", {})
-        
+            return nutrition
+
         print(f"🔍 Cache MISS for {product_name or key}")
         return None
-    
+
     def set_nutrition(self, product_url: str, product_name: str, nutrition_data: Dict[str, Any]) -> None:
         """Store nutrition data in cache."""
         key = self._get_product_key(product_url)
-        
-        self.cache_data["products"][key] = {
-            "product_name": product_name,
-            "product_url": product_url,
-            "nutrition": nutrition_data,
-            "cached_at": datetime.now().isoformat(),
-            "cache_hits": self.cache_data["products"].get(key, {}).get("cache_hits", 0)
-        }
-        
-        print(f"💾 Cached nutrition for {product_name}")
-        self._save_cache()
-    
+
+        try:
+            with self._lock:
+                self._hot[key] = nutrition_data
+                # Fold any unflushed hits for this key into the row we write
+                pending = self._pending_hits.pop(key, 0)
+                row = self.conn.execute(
+                    "SELECT cache_hits FROM products WHERE key = ?", (key,)
+                ).fetchone()
+                cache_hits = (row[0] if row else 0) + pending
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        product_name,
+                        product_url,
+                        orjson.dumps(nutrition_data).decode(),
+                        cache_hits,
+                        datetime.now().isoformat(),
+                    )
+                )
+                self._touch_last_updated()
+            print(f"💾 Cached nutrition for {product_name}")
+        except sqlite3.Error as e:
+            print(f"❌ Error saving cache: {e}")
+
     def increment_hit_count(self, product_url: str) -> None:
-        """Increment cache hit counter for analytics."""
+        """Increment cache hit counter for analytics.
+
+        Deltas are accumulated in memory and flushed in batches so the
+        read path never pays per-hit disk I/O.
+        """
         key = self._get_product_key(product_url)
-        if key in self.cache_data["products"]:
-            self.cache_data["products"][key]["cache_hits"] = (
-                self.cache_data["products"][key].get("cache_hits", 0) + 1
-            )
-    
+        with self._lock:
+            self._pending_hits[key] += 1
+            self._total_hits += 1
+            if sum(self._pending_hits.values()) >= HIT_FLUSH_THRESHOLD:
+                self._flush_hits()
+
+    def _flush_hits(self) -> None:
+        """Write accumulated hit-count deltas to SQLite in one batch."""
+        try:
+            with self._lock:
+                if not self._pending_hits:
+                    return
+                self.conn.executemany(
+                    "UPDATE products SET cache_hits = cache_hits + ? WHERE key = ?",
+                    [(count, key) for key, count in self._pending_hits.items()]
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES ('total_hits', ?)",
+                    (self._total_hits,)
+                )
+                self._pending_hits.clear()
+        except sqlite3.Error as e:
+            print(f"❌ Error flushing hit counts: {e}")
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        products = self.cache_data["products"]
-        total_products = len(products)
-        total_hits = sum(p.get("cache_hits", 0) for p in products.values())
-        
-        # Find most popular products
-        popular_products = sorted(
-            products.items(),
-            key=lambda x: x[1].get("cache_hits", 0),
-            reverse=True
-        )[:5]
-        
+        with self._lock:
+            self._flush_hits()
+            total_products = self.conn.execute(
+                "SELECT COUNT(*) FROM products"
+            ).fetchone()[0]
+
+            popular_products = self.conn.execute(
+                "SELECT product_name, cache_hits FROM products"
+                " ORDER BY cache_hits DESC LIMIT 5"
+            ).fetchall()
+
         return {
             "total_cached_products": total_products,
-            "total_cache_hits": total_hits,
-            "cache_file_size_kb": self.cache_file.stat().st_size // 1024 if self.cache_file.exists() else 0,
-            "last_updated": self.cache_data.get("last_updated"),
+            "total_cache_hits": self._total_hits,
+            "cache_file_size_kb": _file_size_kb(str(self.cache_file), int(time.time() / 5)),
+            "last_updated": self._get_last_updated(),
             "most_popular_products": [
-                {
-                    "name": item[1].get("product_name", "Unknown"),
-                    "hits": item[1].get("cache_hits", 0)
-                }
-                for item in popular_products
+                {"name": name or "Unknown", "hits": hits}
+                for name, hits in popular_products
             ]
         }
-    
+
     def clear_cache(self) -> None:
         """Clear all cached data."""
-        self.cache_data = {
-            "cache_version": "1.0",
-            "last_updated": datetime.now().isoformat(),
-            "products": {}
-        }
-        self._save_cache()
+        with self._lock:
+            self._hot.clear()
+            self._pending_hits.clear()
+            self._total_hits = 0
+            self.conn.execute("DELETE FROM products")
+            self.conn.execute("INSERT OR REPLACE INTO metadata VALUES ('total_hits', 0)")
+            self._touch_last_updated()
         print("🗑️ Cache cleared")
-    
+
     def export_to_csv(self, output_file: str = "tesco_nutrition_export.csv") -> None:
         """Export cached nutrition data to CSV for analysis."""
         import csv
-        
+
+        self._flush_hits()
         try:
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            with self._lock, open(output_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                
+
                 # Write header
                 writer.writerow([
-                    'Product ID', 'Product Name', 'Product URL', 
+                    'Product ID', 'Product Name', 'Product URL',
                     'Serving Size', 'Energy', 'Protein', 'Carbs', 'Fat', 'Salt',
                     'Cache Hits', 'Cached At'
                 ])
-                
+
                 # Write data
-                for product_id, data in self.cache_data["products"].items():
-                    nutrition = data.get("nutrition", {})
+                count = 0
+                for key, name, url, nutrition_json, hits, cached_at in self.conn.execute(
+                    "SELECT key, product_name, product_url, nutrition, cache_hits, cached_at FROM products"
+                ):
+                    nutrition = orjson.loads(nutrition_json) if nutrition_json else {}
                     writer.writerow([
-                        product_id,
-                        data.get("product_name", ""),
-                        data.get("product_url", ""),
+                        key,
+                        name or "",
+                        url or "",
                         nutrition.get("serving_size", ""),
                         nutrition.get("energy", ""),
                         nutrition.get("protein", ""),
                         nutrition.get("carbs", ""),
                         nutrition.get("fat", ""),
                         nutrition.get("salt", ""),
-                        data.get("cache_hits", 0),
-                        data.get("cached_at", "")
+                        hits,
+                        cached_at or ""
                     ])
-            
-            print(f"📊 Exported {len(self.cache_data['products'])} products to {output_file}")
-            
+                    count += 1
+
+            print(f"📊 Exported {count} products to {output_file}")
+
         except IOError as e:
             print(f"❌ Error exporting to CSV: {e}")
 
-# Global cache instance
-_nutrition_cache = NutritionCache()
+# Global cache instance, created lazily so importing this module doesn't
+# open the database before anything actually needs it
+_nutrition_cache: Optional[NutritionCache] = None
+_nutrition_cache_lock = threading.Lock()
+
+def _get_cache() -> NutritionCache:
+    """Get (or create) the global cache instance.
+
+    Creation is locked so concurrent first callers (the nutrition thread
+    pool) share one instance instead of each opening its own connection
+    and registering its own atexit flush.
+    """
+    global _nutrition_cache
+    if _nutrition_cache is None:
+        with _nutrition_cache_lock:
+            if _nutrition_cache is None:
+                _nutrition_cache = NutritionCache()
+    return _nutrition_cache
 
 def get_cached_nutrition(product_url: str, product_name: str = "") -> Optional[Dict[str, Any]]:
     """Get nutrition data from cache."""
-    nutrition = _nutrition_cache.get_nutrition(product_url, product_name)
+    cache = _get_cache()
+    nutrition = cache.get_nutrition(product_url, product_name)
     if nutrition:
-        _nutrition_cache.increment_hit_count(product_url)
+        cache.increment_hit_count(product_url)
     return nutrition
 
 def cache_nutrition(product_url: str, product_name: str, nutrition_data: Dict[str, Any]) -> None:
     """Cache nutrition data."""
-    _nutrition_cache.set_nutrition(product_url, product_name, nutrition_data)
+    _get_cache().set_nutrition(product_url, product_name, nutrition_data)
 
 def get_cache_stats() -> Dict[str, Any]:
     """Get cache statistics."""
-    return _nutrition_cache.get_cache_stats()
+    return _get_cache().get_cache_stats()
 
 def clear_nutrition_cache() -> None:
     """Clear the nutrition cache."""
-    _nutrition_cache.clear_cache()
+    _get_cache().clear_cache()
 
 def export_cache_to_csv(output_file: str = "tesco_nutrition_export.csv") -> None:
     """Export cache to CSV."""
-    _nutrition_cache.export_to_csv(output_file)
+    _get_cache().export_to_csv(output_file)
 
 if __name__ == "__main__":
     # Test the cache
     print("🧪 Testing Nutrition Cache")
     print("="*40)
-    
+
     # Show current stats
     stats = get_cache_stats()
     print(f"Cache stats: {stats}")
-    
+
     # Test caching
     test_url = "https://www.tesco.com/groceries/en-GB/products/294007923"
     test_nutrition = {
@@ -207,14 +393,14 @@ if __name__ == "__main__":
         "fat": "3.3g",
         "salt": "0.18g"
     }
-    
+
     # Cache some data
     cache_nutrition(test_url, "Tesco British Chicken Breast", test_nutrition)
-    
+
     # Retrieve it
     cached = get_cached_nutrition(test_url, "Tesco British Chicken Breast")
     print(f"Retrieved: {cached}")
-    
+
     # Show updated stats
     stats = get_cache_stats()
-    print(f"Updated stats: {stats}")
\ No newline at end of file
+    print(f"Updated stats: {stats}")
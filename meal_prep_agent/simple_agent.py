@@ -3,14 +3,19 @@
 Simple meal prep agent using LangGraph with Tesco integration.
 """
 
-from typing import Annotated, List
+import asyncio
+import functools
+import getpass
+from typing import Annotated, List, Optional
+import aiosqlite
+import httpx
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
-from .tesco_real import search_tesco_products_real
 from .tesco_simple import search_tesco_products_simple
 
 # System prompt adapted from your GPT
@@ -50,63 +55,105 @@ MEAL PLANNING PROCESS:
    B. **Consolidated Shopping Basket** with real Tesco data
    C. **Batch-Cooking Instructions** (if needed)
 
-IMPORTANT: Always use the search_tesco_products_real tool to get current pricing and product information from Tesco. Use the nutrition data (per 100g) from Tesco to calculate accurate macros.
+IMPORTANT: Always use the search_tesco_products_simple tool to get current pricing and product information from Tesco. Use the nutrition data (per 100g) from Tesco to calculate accurate macros.
 
 Tone is helpful, concise, and upbeat. Avoid fluff. Emphasize speed, value, strong flavours, and minimal waste. Always double-check and validate macro calculations before presenting them."""
 
+# Singleton message so each LLM turn reuses the same object instead of
+# re-wrapping the prompt string
+_SYSTEM_MESSAGE = SystemMessage(content=MEAL_PREP_SYSTEM_PROMPT)
+
+# User messages shorter than this are treated as dispatch/ack turns that
+# don't need the reasoning model
+_FAST_MODEL_MAX_CHARS = 100
+
+# How many recent messages (beyond the system prompt) to send to the LLM
+_MESSAGE_WINDOW = 16
+
+def _trim_messages(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Cap the conversation sent to the LLM.
+
+    The checkpointer accumulates messages forever, so without a window
+    prefill cost grows O(N) per turn. Keep the system prompt plus the
+    most recent window; the stable prefix also keeps provider-side
+    prompt caching effective.
+    """
+    if len(messages) <= _MESSAGE_WINDOW + 1:
+        return messages
+    start = len(messages) - _MESSAGE_WINDOW
+    # Never let the window open on a ToolMessage: its parent assistant
+    # tool_calls message has been trimmed away, and OpenAI rejects an
+    # orphaned tool-role message outright
+    while start < len(messages) and isinstance(messages[start], ToolMessage):
+        start += 1
+    return messages[:1] + messages[start:]
+
+def _needs_reasoning(messages: List[BaseMessage]) -> bool:
+    """Decide whether a turn needs the o3 reasoning model.
+
+    Tool results and short user messages are dispatch work - the model
+    just routes them - so they go to the fast model. Substantial user
+    requests (recipe generation and selection) get full reasoning.
+    """
+    last = messages[-1]
+    if isinstance(last, ToolMessage):
+        return False
+    if isinstance(last, HumanMessage) and len(str(last.content)) < _FAST_MODEL_MAX_CHARS:
+        return False
+    return True
+
 class MealPrepState(dict):
     """State for the meal prep agent."""
     messages: Annotated[List[BaseMessage], add_messages]
 
+# Pooled resources owned by the cached agent, kept here so
+# shutdown_meal_prep_agent can close them when the session ends
+_http_client: Optional[httpx.AsyncClient] = None
+_checkpointer: Optional[AsyncSqliteSaver] = None
+
+@functools.lru_cache(maxsize=1)
 def create_meal_prep_agent():
-    """Create the simple meal prep agent."""
-    
-    # Initialize the LLM with tools - using reasoning model
-    llm = ChatOpenAI(model="o3", temperature=1.0)
+    """Create the simple meal prep agent.
+
+    The compiled graph is cached so repeated calls reuse the same LLM
+    client, tool bindings, and checkpointer instead of rebuilding them
+    on every user input.
+    """
+    global _http_client, _checkpointer
+
+    # Shared pooled HTTP client so every LLM call reuses warm
+    # connections instead of paying a fresh TCP+TLS handshake
+    http_client = httpx.AsyncClient(
+        timeout=120,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+    _http_client = http_client
+
+    # Two LLMs: o3 only for turns that need real reasoning, a cheap
+    # fast model for tool dispatch so most turns don't pay 30-90s
+    reasoning_llm = ChatOpenAI(model="o3", temperature=1.0, http_async_client=http_client)
+    fast_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0, http_async_client=http_client)
     tools = [search_tesco_products_simple]
-    llm_with_tools = llm.bind_tools(tools)
+    reasoning_with_tools = reasoning_llm.bind_tools(tools)
+    fast_with_tools = fast_llm.bind_tools(tools)
     
     # Create tool node
     tool_node = ToolNode(tools)
     
-    def agent_node(state: MealPrepState):
+    async def agent_node(state: MealPrepState):
         """Main agent reasoning node."""
         messages = state["messages"]
-        
+
         # Add system prompt if not present
         if not messages or not isinstance(messages[0], SystemMessage):
-            messages = [SystemMessage(content=MEAL_PREP_SYSTEM_PROMPT)] + messages
-        
-        print("🧠 o3 is thinking deeply about your meal prep request...")
-        print("⏳ This may take 30-90 seconds for complex reasoning...")
-        
-        import time
-        start_time = time.time()
-        
-        # Show periodic thinking indicators
-        import threading
-        thinking = True
-        
-        def show_thinking():
-            dots = 0
-            while thinking:
-                print(f"\r💭 Reasoning{'.' * (dots % 4)}{' ' * (3 - (dots % 4))}", end="", flush=True)
-                time.sleep(1)
-                dots += 1
-        
-        thinking_thread = threading.Thread(target=show_thinking)
-        thinking_thread.daemon = True
-        thinking_thread.start()
-        
-        try:
-            # Get response from LLM
-            response = llm_with_tools.invoke(messages)
-            thinking = False
-            elapsed = time.time() - start_time
-            print(f"\r✨ o3 finished reasoning in {elapsed:.1f} seconds!           ")
-            return {"messages": [response]}
-        finally:
-            thinking = False
+            messages = [_SYSTEM_MESSAGE] + messages
+
+        # Await the LLM so the asyncio loop can overlap network I/O
+        # (tokens are surfaced via graph streaming, so no progress
+        # indicator is needed here)
+        llm = reasoning_with_tools if _needs_reasoning(messages) else fast_with_tools
+        response = await llm.ainvoke(_trim_messages(messages))
+        return {"messages": [response]}
     
     # Create the graph
     workflow = StateGraph(MealPrepState)
@@ -123,20 +170,52 @@ def create_meal_prep_agent():
     )
     workflow.add_edge("tools", "agent")
     
-    # Compile the graph
-    app = workflow.compile()
+    # Compile the graph with a persistent checkpointer so conversation
+    # state survives CLI restarts instead of being re-sent to the LLM.
+    # The async saver matches how the graph is driven (ainvoke/astream);
+    # the sync SqliteSaver raises NotImplementedError on those paths
+    checkpointer = AsyncSqliteSaver(aiosqlite.connect("meal_prep_checkpoints.db"))
+    _checkpointer = checkpointer
+    app = workflow.compile(checkpointer=checkpointer)
     return app
 
+async def shutdown_meal_prep_agent() -> None:
+    """Release the cached agent's pooled resources.
+
+    The checkpointer's SQLite worker thread is non-daemon, so the
+    process won't exit until its connection is closed; the HTTP client's
+    keep-alive pool is bound to the loop it was created on. Closing both
+    and dropping the cached graph lets a later caller rebuild cleanly on
+    its own event loop.
+    """
+    global _http_client, _checkpointer
+    if _checkpointer is not None:
+        await _checkpointer.conn.close()
+        _checkpointer = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    create_meal_prep_agent.cache_clear()
+
 def run_meal_prep_agent(user_input: str) -> str:
     """Run the meal prep agent with user input."""
     
-    agent = create_meal_prep_agent()
-    
     # Initial state
     initial_state = {"messages": [HumanMessage(content=user_input)]}
-    
-    # Run the agent
-    result = agent.invoke(initial_state)
+
+    # Thread per local user so checkpoints are isolated and reusable across runs
+    config = {"configurable": {"thread_id": getpass.getuser()}}
+
+    async def _run_once():
+        # Build, run, and tear down inside one event loop so the pooled
+        # client and checkpointer never outlive the loop they're bound to
+        agent = create_meal_prep_agent()
+        try:
+            return await agent.ainvoke(initial_state, config)
+        finally:
+            await shutdown_meal_prep_agent()
+
+    result = asyncio.run(_run_once())
     
     # Return the last assistant message
     messages = result.get("messages", [])
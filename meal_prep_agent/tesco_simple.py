@@ -3,15 +3,51 @@ Simple Tesco product search using basic product information extraction.
 """
 
 import re
+import threading
 import time
 import random
 from typing import List, Dict, Any
 from urllib.parse import quote_plus
 import requests
 from bs4 import BeautifulSoup
+from cachetools import TTLCache
 from langchain_core.tools import tool
 from .nutrition_cache import get_cached_nutrition, cache_nutrition
 
+# Search results are stable over a planning session, so identical queries
+# are answered from this in-process cache instead of re-paying the very
+# long human-like delays a live scrape costs
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# Nutrition-page patterns, compiled once at import instead of re-resolved
+# through re's pattern cache on every product page
+_SERVING_RE = re.compile(r'(\d+g)')
+_NUTRITION_LIST_CLASS_RE = re.compile(r'nutritional-info-list', re.I)
+
+# All five nutrients in one alternation, mirroring tesco_real: a single
+# finditer pass over the page text replaces five per-nutrient searches
+_NUTRI_RE = re.compile(
+    r'(?P<energy>\d+\.?\d*)\s*kcal'
+    r'|Fat\s*(?P<fat>\d+\.?\d*)\s*g'
+    r'|Salt\s*(?P<salt>\d+\.?\d*)\s*g'
+    r'|Protein\s*(?P<protein>\d+\.?\d*)\s*g'
+    r'|Carbohydrate\s*(?P<carbs>\d+\.?\d*)\s*g',
+    re.I,
+)
+
+
+def _parse_nutrition_text(text: str, nutrition_data: Dict[str, str]) -> None:
+    """Pull all nutrients out of a text block in one scan.
+
+    First occurrence wins (setdefault), so values found in the nutrition
+    list aren't overwritten by the table fallback.
+    """
+    for match in _NUTRI_RE.finditer(text):
+        key = match.lastgroup
+        unit = 'kcal' if key == 'energy' else 'g'
+        nutrition_data.setdefault(key, f"{match.group(key)}{unit}")
+
 
 class SimpleTescoScraper:
     """Simple scraper focusing on basic product extraction."""
@@ -24,6 +60,11 @@ class SimpleTescoScraper:
     
     def _setup_session(self):
         """Setup session with realistic headers."""
+        # Explicit connection pool so repeated requests reuse keep-alive
+        # TCP+TLS connections instead of handshaking every time
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+
         # Real browser user agents
         user_agents = [
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -299,27 +340,17 @@ class SimpleTescoScraper:
             serving_size_element = soup.find('div', class_='ILAuM5ZwahtJKTg')
             if serving_size_element:
                 serving_text = serving_size_element.get_text().strip()
-                serving_match = re.search(r'(\d+g)', serving_text)
+                serving_match = _SERVING_RE.search(serving_text)
                 if serving_match:
                     nutrition_data['serving_size'] = serving_match.group(1)
-            
+
             # Look for nutrition list
-            nutrition_list = soup.find('dl', class_=re.compile(r'nutritional-info-list', re.I))
+            nutrition_list = soup.find('dl', class_=_NUTRITION_LIST_CLASS_RE)
             if nutrition_list:
                 nutrition_text = nutrition_list.get_text()
-                
-                # Extract nutrition values
-                energy_match = re.search(r'(\d+\.?\d*)\s*kcal', nutrition_text, re.I)
-                if energy_match:
-                    nutrition_data['energy'] = f"{energy_match.group(1)}kcal"
-                
-                fat_match = re.search(r'Fat\s+(\d+\.?\d*)\s*g', nutrition_text, re.I)
-                if fat_match:
-                    nutrition_data['fat'] = f"{fat_match.group(1)}g"
-                
-                salt_match = re.search(r'Salt\s+(\d+\.?\d*)\s*g', nutrition_text, re.I)
-                if salt_match:
-                    nutrition_data['salt'] = f"{salt_match.group(1)}g"
+
+                # One pass pulls energy, fat, salt, protein and carbs
+                _parse_nutrition_text(nutrition_text, nutrition_data)
             
             # Look for table data for protein and carbs
             tables = soup.find_all('table')
@@ -327,13 +358,8 @@ class SimpleTescoScraper:
                 if 'nutrition' in table.get_text().lower() or 'protein' in table.get_text().lower():
                     table_text = table.get_text()
                     
-                    protein_match = re.search(r'Protein\s*(\d+\.?\d*)\s*g', table_text, re.I)
-                    if protein_match:
-                        nutrition_data['protein'] = f"{protein_match.group(1)}g"
-                    
-                    carb_match = re.search(r'Carbohydrate\s*(\d+\.?\d*)\s*g', table_text, re.I)
-                    if carb_match:
-                        nutrition_data['carbs'] = f"{carb_match.group(1)}g"
+                    # Same single-pass scan; setdefault keeps list values
+                    _parse_nutrition_text(table_text, nutrition_data)
                     break
             
             # Default serving size if not found
@@ -361,14 +387,24 @@ def search_tesco_products_simple(query: str, limit: int = 5, extract_nutrition:
         List of products with basic information and optional nutrition data
     """
     try:
+        cache_key = (query.strip().lower(), limit, extract_nutrition)
+        with _SEARCH_CACHE_LOCK:
+            cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            print(f"🎯 Cache HIT for search '{query}'")
+            return cached
+
         scraper = SimpleTescoScraper(extract_nutrition=extract_nutrition)
         products = scraper.search_products(query, limit)
-        
+
         if not products:
+            # Empty results usually mean we were blocked - don't remember them
             return [{"message": f"No products found for '{query}' - search may be temporarily limited"}]
-        
+
+        with _SEARCH_CACHE_LOCK:
+            _SEARCH_CACHE[cache_key] = products
         return products
-        
+
     except Exception as e:
         print(f"❌ Error in simple Tesco search: {e}")
         return [{"error": f"Search failed: {str(e)}"}]
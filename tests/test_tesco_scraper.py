@@ -5,14 +5,21 @@ Test suite for the Tesco scraper to ensure it extracts real data correctly.
 import pytest
 import re
 from unittest.mock import Mock, patch
-from meal_prep_agent.tesco_real import RealTescoScraper, search_tesco_products_real
+from meal_prep_agent.tesco_real import (
+    RealTescoScraper,
+    clear_search_caches,
+    search_tesco_products_real,
+)
 
 
 class TestRealTescoScraper:
     """Test the real Tesco scraper functionality."""
-    
+
     def setup_method(self):
         """Set up test fixtures."""
+        # The search caches persist across processes - clear them so
+        # mocked results from one test (or run) can't leak into another
+        clear_search_caches()
         self.scraper = RealTescoScraper()
     
     def test_scraper_initialization(self):